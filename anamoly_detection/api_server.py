@@ -3,19 +3,41 @@ Real-Time Anomaly Detection API Server
 DataGems EOSC Project
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
 from typing import List, Optional
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from anyio import to_thread
 import numpy as np
-from collections import defaultdict
+from numba import njit, prange
 from datetime import datetime
-import json
+import os
+import threading
+import orjson
+
+# Upper bound on threads used for run_in_threadpool within one worker.
+# Kernel launches are serialized by _KERNEL_LOCK, so extra threads only queue
+# behind the running kernel; detection throughput scales with workers, not threads.
+THREADPOOL_SIZE = 32
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+
 
 app = FastAPI(
     title="Real-Time Data Anomaly Detection API",
     description="Weather Time Series Anomaly Detection Service | DataGems EOSC Project",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -27,10 +49,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (test data, anomaly lists) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # ============================================================================
 # Data Models
 # ============================================================================
 
+# Variables checked for anomalies, in matrix column order
+VARIABLES = ['temp_out', 'out_hum', 'wind_speed', 'bar', 'rain']
+
+
 class Observation(BaseModel):
     station_id: str = Field(..., description="Weather station ID")
     timestamp: int = Field(..., description="Unix timestamp")
@@ -40,8 +69,10 @@ class Observation(BaseModel):
     bar: float = Field(..., description="Barometric pressure (hPa)")
     rain: float = Field(..., description="Rainfall (mm)")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        strict=True,
+        allow_inf_nan=False,
+        json_schema_extra={
             "example": {
                 "station_id": "574",
                 "timestamp": 1729580400,
@@ -52,16 +83,23 @@ class Observation(BaseModel):
                 "rain": 0.0
             }
         }
+    )
 
 
-class DetectionRequest(BaseModel):
-    observations: List[Observation] = Field(..., description="List of observations (user-defined)")
+class DetectionParameters(BaseModel):
     window_len: int = Field(60, description="Window length W - number of time points (user-defined)", ge=3, le=200)
     stride: int = Field(18, description="Stride S - sliding step (user-defined)", ge=1, le=100)
     threshold: float = Field(2.5, description="Z-score threshold for anomaly detection (user-defined)", ge=1.0, le=5.0)
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(strict=True, allow_inf_nan=False)
+
+
+class DetectionRequest(DetectionParameters):
+    observations: List[Observation] = Field(..., description="List of observations (user-defined)")
+    
+    model_config = ConfigDict(
+        strict=True,
+        json_schema_extra={
             "example": {
                 "observations": [
                     {
@@ -160,6 +198,43 @@ class DetectionRequest(BaseModel):
                 "threshold": 2.5
             }
         }
+    )
+
+
+class DetectionRequestColumnar(DetectionParameters):
+    station_ids: List[str] = Field(..., description="Station ID of each observation")
+    timestamps: List[int] = Field(..., description="Unix timestamp of each observation")
+    temp_out: List[float] = Field(..., description="Outdoor temperature (°C) of each observation")
+    out_hum: List[float] = Field(..., description="Outdoor humidity (%) of each observation")
+    wind_speed: List[float] = Field(..., description="Wind speed (m/s) of each observation")
+    bar: List[float] = Field(..., description="Barometric pressure (hPa) of each observation")
+    rain: List[float] = Field(..., description="Rainfall (mm) of each observation")
+    
+    model_config = ConfigDict(
+        strict=True,
+        json_schema_extra={
+            "example": {
+                "station_ids": ["station_001", "station_001", "station_001", "station_001"],
+                "timestamps": [1729580400, 1729581000, 1729581600, 1729582200],
+                "temp_out": [15.2, 15.8, 100.0, 16.5],
+                "out_hum": [80.0, 79.0, 78.0, 77.0],
+                "wind_speed": [5.5, 5.2, 5.8, 6.0],
+                "bar": [1013.2, 1013.5, 1013.8, 1014.0],
+                "rain": [0.0, 0.0, 0.0, 0.0],
+                "window_len": 10,
+                "stride": 1,
+                "threshold": 2.5
+            }
+        }
+    )
+    
+    @model_validator(mode="after")
+    def check_lengths(self):
+        n = len(self.station_ids)
+        for name in ["timestamps"] + VARIABLES:
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"'{name}' has {len(getattr(self, name))} values, expected {n} (one per station_id)")
+        return self
 
 
 class AnomalyResult(BaseModel):
@@ -186,61 +261,271 @@ class DetectionResponse(BaseModel):
 # Anomaly Detection Logic
 # ============================================================================
 
-def detect_temporal_anomalies(observations: List[Observation], threshold: float = 2.5) -> List[AnomalyResult]:
+# The kernels are compiled eagerly for these exact signatures when the module
+# is imported (or loaded from the on-disk cache), so no request pays for JIT
+# and calls skip type dispatch. Inputs must match: float32 observations,
+# int64 row bounds.
+_ZSCORE_SIGNATURE = (
+    "Tuple((int64[::1], int64[::1], int64[::1], int64[::1], int64[::1], float32[::1], float32[::1]))"
+    "(float32[:, ::1], int64[::1], int64[::1], float64, int64, int64)"
+)
+
+
+@njit("UniTuple(float64, 2)(float32[:])", cache=True)
+def _mean_std(x):
     """
-    Detect temporal anomalies using Z-score method.
-    Analyzes each station's time series independently.
+    Mean and population standard deviation in a single pass (Welford).
+    Accumulates in float64 even for float32 input.
     """
-    anomalies = []
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for v in x:
+        n += 1
+        delta = v - mean
+        mean += delta / n
+        m2 += delta * (v - mean)
+    if n == 0:
+        return mean, 0.0
+    return mean, np.sqrt(m2 / n)
+
+
+@njit("UniTuple(float64[::1], 2)(float32[:], int64)", cache=True)
+def _rolling_mean_std(x, W):
+    """
+    Mean and standard deviation of every length-W window of x in O(n).
+    The first window is seeded with Welford, then each step removes
+    x[i - 1] and adds x[i + W - 1] instead of recomputing the window.
+    """
+    n_windows = len(x) - W + 1
+    means = np.empty(n_windows, dtype=np.float64)
+    stds = np.empty(n_windows, dtype=np.float64)
+    mean, std = _mean_std(x[:W])
+    m2 = std * std * W
+    means[0] = mean
+    stds[0] = std
+    for i in range(1, n_windows):
+        # Promote before subtracting; float32 differences would accumulate
+        # rounding error in m2 across the slide
+        x_old = np.float64(x[i - 1])
+        x_new = np.float64(x[i + W - 1])
+        new_mean = mean + (x_new - x_old) / W
+        m2 += (x_new - x_old) * (x_new - new_mean + x_old - mean)
+        if m2 < 0.0:
+            m2 = 0.0
+        mean = new_mean
+        means[i] = mean
+        stds[i] = np.sqrt(m2 / W)
+    return means, stds
+
+
+@njit(_ZSCORE_SIGNATURE, cache=True, parallel=True, fastmath=True, nogil=True)
+def _zscore_anomalies(mat, starts, ends, thr, window_len, stride):
+    """
+    Sliding-window z-score sweep over an (N, V) matrix, one column per variable,
+    whose rows are grouped by station: group g is rows starts[g]:ends[g],
+    sorted by timestamp. Every (station, variable) pair is an independent
+    task, and tasks run in parallel.
     
-    # Group observations by station
-    station_data = defaultdict(list)
-    for obs in observations:
-        station_data[obs.station_id].append(obs)
+    Windows of length W = min(window_len, group size) start at 0, stride,
+    2 * stride, ... within each group, plus a final window ending at the
+    group's last row so the newest observations are always covered. Each
+    window scores only the rows it adds past the previous window (the whole
+    first window, then its tail), against its own mean/std, so every point
+    is reported at most once. Points are tested as |x - mean| > thr * std,
+    so the division is only done for hits. Groups with fewer than 3 rows
+    are skipped.
     
-    # Variables to check
-    variables = ['temp_out', 'out_hum', 'wind_speed', 'bar', 'rain']
+    Returns (group_idx, var_idx, win_start, win_end, obs_idx, value, z) arrays
+    for every |z| > thr; the row indices are absolute rows of mat. Window
+    statistics are float64; values and z-scores are returned as float32.
+    """
+    n, n_vars = mat.shape
+    n_tasks = len(starts) * n_vars
+    means = np.empty((n, n_vars), dtype=np.float64)
+    stds = np.empty((n, n_vars), dtype=np.float64)
+    counts = np.zeros(n_tasks, dtype=np.int64)
     
-    for station_id, obs_list in station_data.items():
-        # Sort by timestamp
-        obs_list.sort(key=lambda x: x.timestamp)
-        
-        if len(obs_list) < 3:  # Need at least 3 points for meaningful statistics
+    # First pass: window statistics and number of hits per task. The stats
+    # of a window starting at row lo + w are stored at means[lo + w, j].
+    for t in prange(n_tasks):
+        g = t // n_vars
+        j = t % n_vars
+        lo = starts[g]
+        size = ends[g] - lo
+        if size < 3:
             continue
-        
-        # Get time window
-        timestamps = [obs.timestamp for obs in obs_list]
-        time_start = datetime.fromtimestamp(min(timestamps)).strftime("%Y-%m-%d %H:%M:%S")
-        time_end = datetime.fromtimestamp(max(timestamps)).strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Check each variable
-        for var in variables:
-            values = np.array([getattr(obs, var) for obs in obs_list])
-            
-            # Skip if all values are the same or too few non-zero values
-            if np.std(values) < 1e-6:
-                continue
-            
-            # Calculate Z-scores
-            mean = np.mean(values)
-            std = np.std(values)
-            
-            if std > 0:
-                z_scores = (values - mean) / std
-                
-                # Find anomalies
-                for i, (obs, z_score) in enumerate(zip(obs_list, z_scores)):
-                    if abs(z_score) > threshold:
-                        anomalies.append(AnomalyResult(
-                            time_start=time_start,
-                            time_end=time_end,
-                            station_id=station_id,
-                            variable=var,
-                            anomaly_timestamp=datetime.fromtimestamp(obs.timestamp).strftime("%Y-%m-%d %H:%M:%S"),
-                            anomaly_value=round(float(getattr(obs, var)), 2),
-                            z_score=round(float(z_score), 2)
-                        ))
+        W = min(window_len, size)
+        col_means, col_stds = _rolling_mean_std(mat[lo:ends[g], j], W)
+        n_windows = size - W + 1
+        means[lo:lo + n_windows, j] = col_means
+        stds[lo:lo + n_windows, j] = col_stds
+        k = 0
+        last = lo + n_windows - 1
+        w = lo
+        scored_to = lo
+        while True:
+            std = stds[w, j]
+            if std >= 1e-6:
+                mean = means[w, j]
+                limit = thr * std
+                for i in range(max(w, scored_to), w + W):
+                    if abs(mat[i, j] - mean) > limit:
+                        k += 1
+            scored_to = w + W
+            if w == last:
+                break
+            w = min(w + stride, last)
+        counts[t] = k
+    
+    offsets = np.zeros(n_tasks + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    total = offsets[n_tasks]
+    group_idx = np.empty(total, dtype=np.int64)
+    var_idx = np.empty(total, dtype=np.int64)
+    win_start = np.empty(total, dtype=np.int64)
+    win_end = np.empty(total, dtype=np.int64)
+    obs_idx = np.empty(total, dtype=np.int64)
+    values = np.empty(total, dtype=mat.dtype)
+    z_out = np.empty(total, dtype=np.float32)
+    
+    # Second pass: each task fills its own slice of the output
+    for t in prange(n_tasks):
+        if counts[t] == 0:
+            continue
+        g = t // n_vars
+        j = t % n_vars
+        lo = starts[g]
+        size = ends[g] - lo
+        W = min(window_len, size)
+        pos = offsets[t]
+        last = lo + size - W
+        w = lo
+        scored_to = lo
+        while True:
+            std = stds[w, j]
+            if std >= 1e-6:
+                mean = means[w, j]
+                limit = thr * std
+                for i in range(max(w, scored_to), w + W):
+                    deviation = mat[i, j] - mean
+                    if abs(deviation) > limit:
+                        group_idx[pos] = g
+                        var_idx[pos] = j
+                        win_start[pos] = w
+                        win_end[pos] = w + W - 1
+                        obs_idx[pos] = i
+                        values[pos] = mat[i, j]
+                        z_out[pos] = deviation / std
+                        pos += 1
+            scored_to = w + W
+            if w == last:
+                break
+            w = min(w + stride, last)
+    return group_idx, var_idx, win_start, win_end, obs_idx, values, z_out
+
+
+# Numba's default (workqueue) threading layer aborts the process if two
+# threads launch a parallel kernel at once, and detection runs in the
+# threadpool. The kernel already uses every core, so launches are serialized.
+_KERNEL_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=8192)
+def _format_timestamp(ts: int) -> str:
+    """
+    Unix timestamp to local "YYYY-MM-DD HH:MM:SS".
+    Cached because streaming clients resend overlapping windows.
+    """
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def detect_temporal_anomalies(
+    observations: List[Observation],
+    threshold: float = 2.5,
+    window_len: int = 60,
+    stride: int = 18
+) -> List[dict]:
+    """
+    Detect temporal anomalies using Z-score method over sliding windows.
+    Analyzes each station's time series independently. Each observation is
+    scored once, against the first window that contains it; the last window
+    always ends at the station's newest observation. A series shorter than
+    window_len is treated as a single window.
+    """
+    n = len(observations)
+    station_ids = np.array([obs.station_id for obs in observations])
+    timestamps = np.fromiter((obs.timestamp for obs in observations), dtype=np.int64, count=n)
+    
+    # Materialize all observations as one (N, 5) matrix, one column per variable
+    mat = np.fromiter(
+        (v for obs in observations for v in (obs.temp_out, obs.out_hum, obs.wind_speed, obs.bar, obs.rain)),
+        dtype=np.float32,
+        count=n * len(VARIABLES)
+    ).reshape(-1, len(VARIABLES))
+    
+    return detect_columnar_anomalies(station_ids, timestamps, mat, threshold, window_len, stride)
+
+
+def detect_columnar_anomalies(
+    station_ids: np.ndarray,
+    timestamps: np.ndarray,
+    mat: np.ndarray,
+    threshold: float = 2.5,
+    window_len: int = 60,
+    stride: int = 18
+) -> List[dict]:
+    """
+    Same detection as detect_temporal_anomalies, on column arrays:
+    station_ids and timestamps of length N and an (N, 5) float32 matrix.
+    """
+    n = len(station_ids)
+    mat = np.ascontiguousarray(mat, dtype=np.float32)
+    
+    # Rank stations by first appearance so results keep the input's station order
+    stations, first, inverse = np.unique(station_ids, return_index=True, return_inverse=True)
+    appearance = np.argsort(first, kind="stable")
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    station_rank = rank[inverse]
+    
+    # One stable sort groups rows by station, then orders each group by timestamp
+    order = np.lexsort((timestamps, station_rank))
+    timestamps = timestamps[order]
+    mat = mat[order]
+    _, starts = np.unique(station_rank[order], return_index=True)
+    ends = np.append(starts[1:], n)
+    
+    # All stations in one parallel kernel call
+    with _KERNEL_LOCK:
+        group_idx, var_idx, win_start, win_end, obs_idx, values, z_scores = _zscore_anomalies(
+            mat, starts.astype(np.int64), ends.astype(np.int64), float(threshold), window_len, stride
+        )
+    n_anomalies = len(var_idx)
+    if n_anomalies == 0:
+        return []
+    
+    # Format only the timestamps that are referenced, once each
+    needed = np.unique(np.concatenate((win_start, win_end, obs_idx)))
+    ts_str = np.empty(n, dtype=object)
+    ts_str[needed] = [_format_timestamp(ts) for ts in timestamps[needed].tolist()]
+    station_names = [str(station_id) for station_id in stations[appearance]]
     
+    # Plain dicts shaped like AnomalyResult; they are serialized as-is
+    anomalies = [None] * n_anomalies
+    for k, (g, j, ws, we, i, value, z_score) in enumerate(zip(
+        group_idx.tolist(), var_idx.tolist(), win_start.tolist(), win_end.tolist(),
+        obs_idx.tolist(), values.tolist(), z_scores.tolist()
+    )):
+        anomalies[k] = {
+            "time_start": ts_str[ws],
+            "time_end": ts_str[we],
+            "station_id": station_names[g],
+            "variable": VARIABLES[j],
+            "anomaly_timestamp": ts_str[i],
+            "anomaly_value": round(value, 2),
+            "z_score": round(z_score, 2)
+        }
     return anomalies
 
 
@@ -248,6 +533,19 @@ def detect_temporal_anomalies(observations: List[Observation], threshold: float
 # API Endpoints
 # ============================================================================
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    Same 422 body as FastAPI's default handler, encoded with orjson so that
+    rejected NaN/Infinity inputs are echoed as null instead of failing to encode.
+    """
+    return Response(
+        content=orjson.dumps({"detail": jsonable_encoder(exc.errors())}),
+        status_code=422,
+        media_type="application/json"
+    )
+
+
 @app.get("/")
 async def root():
     """API information and status"""
@@ -260,6 +558,8 @@ async def root():
         "documentation": "https://datagems-eosc.github.io/real_time_data_profiler/",
         "endpoints": {
             "POST /detect": "Detect anomalies in observation data",
+            "POST /detect/raw": "Detect anomalies in a /detect body, skipping per-observation validation (large payloads)",
+            "POST /detect/columnar": "Detect anomalies in observation data sent as parallel arrays (large payloads)",
             "GET /test-data": "Get sample test data"
         }
     }
@@ -267,31 +567,80 @@ async def root():
 
 
 
+def _load_test_data() -> Optional[bytes]:
+    """
+    Read the sample test data once and pre-serialize the /test-data response.
+    Returns None if the file is missing.
+    """
+    try:
+        with open('api_test_data.json', 'rb') as f:
+            test_data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    
+    return orjson.dumps({
+        "message": "Sample test data for 10 stations, 60 time points each",
+        "total_observations": len(test_data),
+        "stations": list(set(obs['station_id'] for obs in test_data)),
+        "time_range": {
+            "start": test_data[0]['datetime'] if test_data else None,
+            "end": test_data[-1]['datetime'] if test_data else None
+        },
+        "observations": test_data
+    })
+
+
+_TEST_DATA_BYTES = _load_test_data()
+
+
 @app.get("/test-data")
 async def get_test_data():
     """
     Get sample test data for API testing.
     Returns observations for 10 stations with 60 time points each.
     """
-    try:
-        with open('api_test_data.json', 'r') as f:
-            test_data = json.load(f)
-        
-        return {
-            "message": "Sample test data for 10 stations, 60 time points each",
-            "total_observations": len(test_data),
-            "stations": list(set(obs['station_id'] for obs in test_data)),
-            "time_range": {
-                "start": test_data[0]['datetime'] if test_data else None,
-                "end": test_data[-1]['datetime'] if test_data else None
-            },
-            "observations": test_data
-        }
-    except FileNotFoundError:
+    if _TEST_DATA_BYTES is None:
         raise HTTPException(status_code=404, detail="Test data file not found")
+    return Response(content=_TEST_DATA_BYTES, media_type="application/json")
+
+
+def _build_response(
+    anomalies: List[dict],
+    total_observations: int,
+    window_len: int,
+    stride: int,
+    threshold: float
+) -> Response:
+    """
+    Serialize detected anomalies in the DetectionResponse shape.
+    Built as a plain dict and encoded with orjson so FastAPI doesn't
+    re-walk every anomaly through the response model.
+    """
+    if len(anomalies) > 0:
+        status = "anomalies_found"
+        message = f"✓ Detection completed. Found {len(anomalies)} anomalie(s) in {total_observations} observations."
+    else:
+        status = "no_anomalies"
+        message = f"✓ Detection completed. No anomalies detected in {total_observations} observations. All values are within normal range."
+    
+    payload = {
+        "status": status,
+        "message": message,
+        "detection_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_observations": total_observations,
+        "total_anomalies": len(anomalies),
+        "parameters": {
+            "window_len": window_len,
+            "stride": stride,
+            "threshold": threshold,
+            "variables": VARIABLES
+        },
+        "anomalies": anomalies
+    }
+    return Response(content=orjson.dumps(payload), media_type="application/json")
 
 
-@app.post("/detect", response_model=DetectionResponse)
+@app.post("/detect", response_model=None, responses={200: {"model": DetectionResponse}})
 async def detect_anomalies(request: DetectionRequest):
     """
     Detect anomalies in weather time series data.
@@ -325,37 +674,156 @@ async def detect_anomalies(request: DetectionRequest):
             detail=f"Insufficient data: {len(request.observations)} observations provided. Minimum 3 required for statistical analysis."
         )
     
-    # Perform anomaly detection
+    # Perform anomaly detection off the event loop; it is CPU-bound
     try:
-        anomalies = detect_temporal_anomalies(
+        anomalies = await run_in_threadpool(
+            detect_temporal_anomalies,
             request.observations,
-            threshold=request.threshold
+            threshold=request.threshold,
+            window_len=request.window_len,
+            stride=request.stride
         )
         
-        # Prepare response
-        if len(anomalies) > 0:
-            status = "anomalies_found"
-            message = f"✓ Detection completed. Found {len(anomalies)} anomalie(s) in {len(request.observations)} observations."
-        else:
-            status = "no_anomalies"
-            message = f"✓ Detection completed. No anomalies detected in {len(request.observations)} observations. All values are within normal range."
+        return _build_response(
+            anomalies, len(request.observations), request.window_len, request.stride, request.threshold
+        )
         
-        response = DetectionResponse(
-            status=status,
-            message=message,
-            detection_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            total_observations=len(request.observations),
-            total_anomalies=len(anomalies),
-            parameters={
-                "window_len": request.window_len,
-                "stride": request.stride,
-                "threshold": request.threshold,
-                "variables": ["temp_out", "out_hum", "wind_speed", "bar", "rain"]
-            },
-            anomalies=anomalies
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
+
+
+@app.post("/detect/columnar", response_model=None, responses={200: {"model": DetectionResponse}})
+async def detect_anomalies_columnar(request: DetectionRequestColumnar):
+    """
+    Detect anomalies in weather time series data sent as parallel arrays.
+    
+    Same detection and response as `POST /detect`, but each field is one
+    array over all observations instead of one object per observation.
+    Preferred for large payloads: no per-observation model is built and
+    the arrays are loaded straight into NumPy.
+    
+    **Example:**
+    ```
+    POST /detect/columnar
+    {
+        "station_ids": ["574", "574", ...],
+        "timestamps": [1729580400, 1729581000, ...],
+        "temp_out": [...], "out_hum": [...], "wind_speed": [...], "bar": [...], "rain": [...],
+        "window_len": 60,
+        "stride": 18,
+        "threshold": 2.5
+    }
+    ```
+    """
+    n = len(request.station_ids)
+    if n == 0:
+        raise HTTPException(status_code=400, detail="No observations provided")
+    
+    if n < 3:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Insufficient data: {n} observations provided. Minimum 3 required for statistical analysis."
         )
+    
+    try:
+        mat = np.column_stack([np.asarray(getattr(request, var), dtype=np.float32) for var in VARIABLES])
+        anomalies = await run_in_threadpool(
+            detect_columnar_anomalies,
+            np.asarray(request.station_ids),
+            np.asarray(request.timestamps, dtype=np.int64),
+            mat,
+            threshold=request.threshold,
+            window_len=request.window_len,
+            stride=request.stride
+        )
+        return _build_response(anomalies, n, request.window_len, request.stride, request.threshold)
         
-        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
+
+
+@app.post("/detect/raw", response_model=None, responses={200: {"model": DetectionResponse}})
+async def detect_anomalies_raw(request: Request):
+    """
+    Detect anomalies from a raw `POST /detect` body without per-observation validation.
+    
+    Accepts the same JSON body and returns the same response as `POST /detect`.
+    Observations are loaded straight into NumPy instead of being validated
+    one model at a time. The checks are: at least 3 observations, every field
+    present, station_id a string, timestamp an integer, and the five variables
+    finite numbers (booleans, null and numeric strings are rejected). Any
+    failure returns 400. Use `POST /detect` for full schema checks.
+    """
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    
+    try:
+        params = DetectionParameters.model_validate(
+            {k: data[k] for k in ("window_len", "stride", "threshold") if k in data}
+        )
+    except ValidationError as e:
+        # Match the errors FastAPI reports for the same fields on /detect
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)
+        ])
+    
+    observations = data.get("observations")
+    if not isinstance(observations, list) or not observations:
+        raise HTTPException(status_code=400, detail="No observations provided")
+    
+    n = len(observations)
+    if n < 3:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Insufficient data: {n} observations provided. Minimum 3 required for statistical analysis."
+        )
+    
+    try:
+        station_ids = [obs["station_id"] for obs in observations]
+        timestamps = [obs["timestamp"] for obs in observations]
+        values = [obs[var] for obs in observations for var in VARIABLES]
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Missing field {e} in observations")
+    except TypeError:
+        raise HTTPException(status_code=400, detail="Each observation must be a JSON object")
+    
+    # Exact type checks: NumPy would silently coerce null, booleans, numeric
+    # strings and fractional timestamps
+    if any(type(s) is not str for s in station_ids):
+        raise HTTPException(status_code=400, detail="Invalid observation values: station_id must be a string")
+    if any(type(t) is not int for t in timestamps):
+        raise HTTPException(status_code=400, detail="Invalid observation values: timestamp must be an integer")
+    if any(type(v) is not float and type(v) is not int for v in values):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid observation values: {', '.join(VARIABLES)} must be numbers"
+        )
+    
+    try:
+        timestamps = np.array(timestamps, dtype=np.int64)
+    except OverflowError:
+        raise HTTPException(status_code=400, detail="Invalid observation values: timestamp out of range")
+    with np.errstate(over="ignore"):
+        mat = np.array(values, dtype=np.float32).reshape(-1, len(VARIABLES))
+    if not np.isfinite(mat).all():
+        raise HTTPException(status_code=400, detail="Invalid observation values: values must be finite")
+    station_ids = np.array(station_ids)
+    
+    try:
+        anomalies = await run_in_threadpool(
+            detect_columnar_anomalies,
+            station_ids,
+            timestamps,
+            mat,
+            threshold=params.threshold,
+            window_len=params.window_len,
+            stride=params.stride
+        )
+        return _build_response(anomalies, n, params.window_len, params.stride, params.threshold)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
@@ -377,5 +845,17 @@ if __name__ == "__main__":
     print("   Access from outside: http://YOUR_SERVER_IP:8000")
     print("\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker process per core; CPU-bound detection scales with workers.
+    # With every core taken by a worker, each worker's Numba kernel runs on a
+    # single thread (see gunicorn_conf.py for the WEB_CONCURRENCY split).
+    workers = os.cpu_count() or 1
+    os.environ.setdefault("NUMBA_NUM_THREADS", "1")
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
+    )
 
@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for the Anomaly Detection API Server
+DataGems EOSC Project
+
+Usage: gunicorn -c gunicorn_conf.py api_server:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# One worker per core: detection is CPU-bound and scales with processes
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Each worker's parallel Numba kernel would otherwise start one thread per
+# core; split the cores between workers so workers x threads stays at the
+# core count. With the default of one worker per core this is 1, so the kernel
+# only runs in parallel when WEB_CONCURRENCY is set below the core count.
+# Set here because the config is loaded before the app imports Numba.
+os.environ.setdefault("NUMBA_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // workers)))
+
+# Import api_server once in the master so the compiled Numba kernels and the
+# pre-serialized test data are shared with the forked workers (copy-on-write)
+preload_app = True
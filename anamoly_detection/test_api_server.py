@@ -0,0 +1,228 @@
+"""
+Tests for the Anomaly Detection API Server
+DataGems EOSC Project
+
+Run with: pytest test_api_server.py
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from api_server import (
+    Observation,
+    _rolling_mean_std,
+    app,
+    detect_temporal_anomalies,
+)
+
+TEST_DATA_PATH = os.path.join(os.path.dirname(__file__), "api_test_data.json")
+START = 1729580400
+
+
+def make_series(n, spikes=(), station_id="S1"):
+    """
+    Smooth 10-minute series with |z| <= sqrt(2) for every variable,
+    plus temp_out spikes at the given row indices.
+    """
+    observations = []
+    for i in range(n):
+        wave = math.sin(i * 2 * math.pi / 20)
+        observations.append({
+            "station_id": station_id,
+            "timestamp": START + 600 * i,
+            "temp_out": 100.0 if i in spikes else 15.0 + wave,
+            "out_hum": 80.0 + 5 * wave,
+            "wind_speed": 5.0 + wave,
+            "bar": 1013.0 + wave,
+            "rain": 1.0 + 0.5 * wave,
+        })
+    return observations
+
+
+def detect(observations, **kwargs):
+    return detect_temporal_anomalies([Observation(**obs) for obs in observations], **kwargs)
+
+
+def to_columnar(observations):
+    body = {
+        "station_ids": [obs["station_id"] for obs in observations],
+        "timestamps": [obs["timestamp"] for obs in observations],
+    }
+    for field in ["temp_out", "out_hum", "wind_speed", "bar", "rain"]:
+        body[field] = [obs[field] for obs in observations]
+    return body
+
+
+def test_each_point_reported_once_with_overlapping_windows():
+    # README "Example 2": first 50 test observations, W=10, S=1
+    with open(TEST_DATA_PATH) as f:
+        test_data = json.load(f)[:50]
+    observations = [{k: v for k, v in obs.items() if k != "datetime"} for obs in test_data]
+
+    anomalies = detect(observations, threshold=2.5, window_len=10, stride=1)
+
+    keys = [(a["station_id"], a["variable"], a["anomaly_timestamp"]) for a in anomalies]
+    assert len(keys) == len(set(keys))
+
+
+def test_mid_series_spike_reported_once():
+    anomalies = detect(make_series(100, spikes={50}), window_len=60, stride=18)
+
+    assert [a["variable"] for a in anomalies] == ["temp_out"]
+    assert anomalies[0]["anomaly_value"] == 100.0
+
+
+def test_final_window_covers_newest_observations():
+    # Windows start at 0, 18, 36 and a final one at 40, which reaches row 99
+    anomalies = detect(make_series(100, spikes={99}), window_len=60, stride=18)
+
+    assert len(anomalies) == 1
+    assert anomalies[0]["anomaly_timestamp"] == anomalies[0]["time_end"]
+
+
+def test_series_shorter_than_window_is_one_window():
+    observations = make_series(30, spikes={3})
+
+    anomalies = detect(observations, window_len=60, stride=18)
+
+    values = [obs["temp_out"] for obs in observations]
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+    assert len(anomalies) == 1
+    assert anomalies[0]["z_score"] == round((100.0 - mean) / std, 2)
+
+
+def test_raw_endpoint_matches_detect():
+    client = TestClient(app)
+    body = {"observations": make_series(100, spikes={50, 99}), "window_len": 60, "stride": 18}
+
+    detect = client.post("/detect", json=body).json()
+    raw = client.post("/detect/raw", json=body).json()
+
+    assert raw["total_anomalies"] == detect["total_anomalies"] == 2
+    assert raw["anomalies"] == detect["anomalies"]
+
+
+@pytest.mark.parametrize("field, value", [
+    ("temp_out", None),
+    ("temp_out", True),
+    ("temp_out", "15.2"),
+    ("bar", 1e39),
+    ("timestamp", 1729583400.7),
+    ("timestamp", "1729583400"),
+    ("station_id", 574),
+])
+def test_raw_endpoint_rejects_invalid_values(field, value):
+    observations = make_series(10)
+    observations[3][field] = value
+
+    response = TestClient(app).post("/detect/raw", json={"observations": observations})
+
+    assert response.status_code == 400
+    assert "Invalid observation values" in response.json()["detail"]
+
+
+def test_raw_endpoint_rejects_missing_field():
+    observations = make_series(10)
+    del observations[3]["rain"]
+
+    response = TestClient(app).post("/detect/raw", json={"observations": observations})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Missing field 'rain' in observations"
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("literal", ["NaN", "Infinity"])
+def test_validated_endpoints_reject_non_finite_values(columnar, literal):
+    # Python's json module accepts NaN/Infinity, so requests can carry them
+    observations = make_series(10)
+    observations[3]["temp_out"] = 12345.5
+    if columnar:
+        path = "/detect/columnar"
+        body = to_columnar(observations)
+    else:
+        path = "/detect"
+        body = {"observations": observations}
+    content = json.dumps(body).replace("12345.5", literal)
+
+    response = TestClient(app).post(path, content=content, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("level, spread, n_noisy", [(0.0, 3.0, 200), (15.0, 5.0, 1000)])
+def test_rolling_std_is_zero_for_flat_stretch_after_noisy_one(level, spread, n_noisy):
+    # Rain-like (wet spell, then zeros) and temperature-like (noise, then flat)
+    rng = np.random.default_rng(0)
+    noisy = level + spread * rng.standard_normal(n_noisy)
+    if level == 0.0:
+        noisy = np.abs(noisy)
+    x = np.concatenate((noisy, np.full(200, level))).astype(np.float32)
+
+    _, stds = _rolling_mean_std(x, 20)
+
+    # Windows lying entirely in the flat stretch must fall under the
+    # std < 1e-6 constant-window guard so _zscore_anomalies skips them
+    assert stds[n_noisy:].max() < 1e-6
+
+
+@pytest.mark.parametrize("params", [{"window_len": 1}, {"stride": 0}, {"threshold": 9.0}])
+def test_raw_endpoint_reports_parameter_errors_like_detect(params):
+    client = TestClient(app)
+    body = {"observations": make_series(10), **params}
+
+    detect = client.post("/detect", json=body)
+    raw = client.post("/detect/raw", json=body)
+
+    assert detect.status_code == raw.status_code == 422
+    assert raw.json() == detect.json()
+
+
+def test_interleaved_stations_grouped_in_first_appearance_order():
+    b = make_series(100, spikes={20, 99}, station_id="B")
+    a = make_series(100, spikes={50}, station_id="A")
+    c = make_series(2, spikes={1}, station_id="C")
+    # B appears first although "A" sorts first; all other rows arrive shuffled
+    rest = a + b[1:] + c
+    interleaved = [b[0]] + [rest[i] for i in np.random.default_rng(0).permutation(len(rest))]
+
+    anomalies = detect(interleaved, window_len=60, stride=18)
+
+    # Same result as detecting each station's time-sorted series on its own;
+    # C has fewer than 3 rows and is skipped
+    assert anomalies == detect(b, window_len=60, stride=18) + detect(a, window_len=60, stride=18)
+    assert [anomaly["station_id"] for anomaly in anomalies] == ["B", "B", "A"]
+
+
+def test_columnar_endpoint_matches_detect():
+    observations = [
+        obs for pair in zip(
+            make_series(100, spikes={50}, station_id="S2"),
+            make_series(100, spikes={30, 99}, station_id="S1"),
+        ) for obs in pair
+    ]
+    client = TestClient(app)
+
+    detect = client.post("/detect", json={"observations": observations, "window_len": 60, "stride": 18}).json()
+    columnar = client.post(
+        "/detect/columnar", json={**to_columnar(observations), "window_len": 60, "stride": 18}
+    ).json()
+
+    assert detect["total_anomalies"] == 3
+    assert columnar["anomalies"] == detect["anomalies"]
+
+
+def test_columnar_endpoint_rejects_unequal_lengths():
+    body = to_columnar(make_series(10))
+    body["rain"].pop()
+
+    response = TestClient(app).post("/detect/columnar", json=body)
+
+    assert response.status_code == 422
+    assert "'rain' has 9 values, expected 10" in response.json()["detail"][0]["msg"]